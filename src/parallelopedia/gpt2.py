@@ -19,7 +19,7 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from os.path import dirname
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import tiktoken
 import torch
@@ -27,6 +27,7 @@ import torch.jit
 import torch.nn as nn
 import torch.profiler
 from torch.nn import functional as F
+from torch.nn.attention import SDPBackend, sdpa_kernel
 from torch.profiler import ProfilerActivity
 
 from parallelopedia.http.server import (
@@ -38,6 +39,16 @@ from parallelopedia.http.server import (
 )
 from parallelopedia.util import ElapsedTimer, get_huggingface_model, join_path
 
+# Use apex's FusedLayerNorm when available: it performs the mean/var
+# reduction and the affine transform in a single CUDA kernel, where
+# nn.LayerNorm launches two and round-trips the activation through HBM
+# in between.  The parameter names match nn.LayerNorm, so checkpoints
+# load identically either way.
+try:
+    from apex.normalization import FusedLayerNorm as LayerNorm
+except ImportError:
+    LayerNorm = nn.LayerNorm
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -62,6 +73,8 @@ else:
 
 MODELS_LOCK = threading.Lock()
 PRETRAINED_MODELS_LOCK = threading.Lock()
+INIT_ONCE_LOCK = threading.Lock()
+INIT_ONCE_DONE = False
 
 # If PARALLELOPEDIA_CPU_ONLY is set, don't try and use CUDA.
 if 'PARALLELOPEDIA_CPU_ONLY' in os.environ or not torch.cuda.is_available():
@@ -77,6 +90,10 @@ if 'PARALLELOPEDIA_CPU_ONLY' in os.environ or not torch.cuda.is_available():
             map_location='cpu',
             torch_profile_activities=TORCH_PROFILE_ACTIVITIES,
         )
+        # Move the weights into shared memory so any forked worker
+        # processes reference the same pages instead of each holding a
+        # private ~500 MB copy.
+        MODELS[0].share_memory()
 
     def get_next_model_random():
         return MODELS[0]
@@ -129,6 +146,11 @@ else:
                     i = futures[future]
                     model = future.result()
                     MODELS[i] = model
+        # Move the CPU model's weights into shared memory so any forked
+        # worker processes reference the same pages instead of each
+        # holding a private ~500 MB copy.  (CUDA models already share
+        # via CUDA IPC when tensors cross process boundaries.)
+        MODELS[NUM_GPUS].share_memory()
         msg = (
             f'Loaded model on {NUM_GPUS} GPU(s) and 1 CPU in '
             f'{timer.elapsed:.3f} seconds.'
@@ -190,6 +212,22 @@ OOPS_NON_PRINTABLE_ENCOUNTERED = (
 )
 DEFAULT_MANUAL_SEED = 42
 
+# Restrict scaled_dot_product_attention to the FlashAttention-2 and
+# memory-efficient backends.  Without an explicit selection, some
+# device/dtype combinations silently fall back to the math backend,
+# which materializes the full (T, T) attention matrix in HBM.
+SDPA_BACKENDS = [
+    SDPBackend.FLASH_ATTENTION,
+    SDPBackend.EFFICIENT_ATTENTION,
+]
+
+# Prompt lengths are rounded up to these bucket sizes for the prefill
+# pass, so the compiled forward only ever sees a handful of distinct
+# shapes.  With dynamic=False, every new sequence length would otherwise
+# trigger a fresh recompile and defeat CUDA-graph capture; the KV-cache
+# decode step is already a fixed (1, 1) shape.
+PREFILL_BUCKETS = (128, 256, 512, 1024)
+
 # =============================================================================
 # Setup
 # =============================================================================
@@ -237,7 +275,7 @@ class CausalSelfAttention(nn.Module):
         self.n_head = config.n_head
         self.n_embd = config.n_embd
 
-    def forward(self, x):
+    def forward(self, x, kv_cache=None, position=0):
         # Batch size, sequence length, embedding dimensionality.
         B, T, C = (x.size())
 
@@ -247,22 +285,36 @@ class CausalSelfAttention(nn.Module):
         # N.B. nh is "number of heads", hs is "head size", and C (number of
         #      channels) is nh * hs.  E.g. in GPT-2 (124M), n_head=12, hs=64,
         #      so nh*hs=C=768 channels in the Transformer.
-        qkv = self.c_attn(x)
-        q, k, v = qkv.split(self.n_embd, dim=2)
-
         head_dim = C // self.n_head
 
-        # (B, nh, T, hs)
-        k = k.view(B, T, self.n_head, head_dim).transpose(1, 2)
-
-        # (B, nh, T, hs)
-        q = q.view(B, T, self.n_head, head_dim).transpose(1, 2)
-
-        # (B, nh, T, hs)
-        v = v.view(B, T, self.n_head, head_dim).transpose(1, 2)
-
-        # Flash attention.
-        y = F.scaled_dot_product_attention(q, k, v, is_causal=True)
+        # Reshape the concatenated QKV projection in one shot: a single
+        # view to (B, T, 3, nh, hs) followed by a permute to
+        # (3, B, nh, T, hs), then unbind the leading dim.  This replaces
+        # the former split + three view/transpose calls, saving two
+        # reshape kernels per layer per decode step.
+        qkv = self.c_attn(x).view(B, T, 3, self.n_head, head_dim)
+        q, k, v = qkv.permute(2, 0, 3, 1, 4).unbind(0)
+
+        if kv_cache is not None:
+            # Incremental decoding: append this step's K/V into the cache
+            # and attend against the cached prefix.  Causality is implicit
+            # for single-token steps, as slots past `position + T` have not
+            # been filled in yet; for multi-token prefill (position == 0)
+            # an explicit causal mask is still required.
+            (k_cache, v_cache) = kv_cache
+            end = position + T
+            k_cache[:, :, position:end, :] = k
+            v_cache[:, :, position:end, :] = v
+            k = k_cache[:, :, :end, :]
+            v = v_cache[:, :, :end, :]
+            with sdpa_kernel(SDPA_BACKENDS):
+                y = F.scaled_dot_product_attention(
+                    q, k, v, is_causal=(T > 1)
+                )
+        else:
+            # Flash attention.
+            with sdpa_kernel(SDPA_BACKENDS):
+                y = F.scaled_dot_product_attention(q, k, v, is_causal=True)
 
         # Re-assemble all head outputs side by side.
         y = (y.transpose(1, 2).contiguous().view(B, T, C))
@@ -292,13 +344,13 @@ class Block(nn.Module):
 
     def __init__(self, config):
         super().__init__()
-        self.ln_1 = nn.LayerNorm(config.n_embd)
+        self.ln_1 = LayerNorm(config.n_embd)
         self.attn = CausalSelfAttention(config)
-        self.ln_2 = nn.LayerNorm(config.n_embd)
+        self.ln_2 = LayerNorm(config.n_embd)
         self.mlp = MLP(config)
 
-    def forward(self, x):
-        x = x + self.attn(self.ln_1(x))
+    def forward(self, x, kv_cache=None, position=0):
+        x = x + self.attn(self.ln_1(x), kv_cache=kv_cache, position=position)
         x = x + self.mlp(self.ln_2(x))
         return x
 
@@ -336,6 +388,17 @@ class GPTConfig:
     n_embd: int = 768
 
 
+def ensure_gpt_config(config) -> GPTConfig:
+    """
+    Returns a GPTConfig from either a GPTConfig instance or its dict
+    form.  (Gpt2App.init_once() converts model.config to a plain dict
+    prior to torch.compile to avoid graph breaks on the dataclass.)
+    """
+    if isinstance(config, GPTConfig):
+        return config
+    return GPTConfig(**config)
+
+
 @dataclass
 class GPTCheckpoint:
     """
@@ -404,6 +467,43 @@ class GPTCheckpoint:
         pass
 
 
+class _DecodeStep(nn.Module):
+    """
+    `torch.export` wrapper around a single-token, KV-cached decode step.
+
+    The current sequence position is passed as a 0-dim int64 tensor and
+    converted to a SymInt inside the graph (via `.item()` plus
+    `torch._check()` range hints) so that one exported artifact serves
+    every decode position, rather than specializing on the Python int.
+    The KV caches are passed as flattened graph inputs and mutated
+    in-place, so the caller's cache tensors advance exactly as they do
+    on the eager path.
+    """
+
+    def __init__(self, model: "GPT"):
+        super().__init__()
+        self.model = model
+        config = ensure_gpt_config(model.config)
+        self.n_layer = config.n_layer
+        self.block_size = config.block_size
+
+    def forward(self, token, position, *caches):
+        pos = position.item()
+        torch._check(pos >= 0)
+        torch._check(pos < self.block_size)
+        kv_caches = [
+            (caches[i * 2], caches[i * 2 + 1])
+            for i in range(self.n_layer)
+        ]
+        (logits, _) = self.model(
+            token,
+            kv_caches=kv_caches,
+            position=pos,
+            return_last_only=True,
+        )
+        return logits
+
+
 class GPT(nn.Module):
 
     def __init__(self, checkpoint: GPTCheckpoint,
@@ -470,17 +570,42 @@ class GPT(nn.Module):
         logging.info(msg)
 
         if checkpoint.model:
+            # N.B. assign=True adopts the checkpoint tensors directly as
+            #      parameters instead of copying them into the freshly
+            #      allocated ones, halving transient memory during load.
+            #      The checkpoint was already mapped to the target device
+            #      by GPTCheckpoint.load().
             with timer:
                 if not self.torch_profile_activities:
-                    self.load_state_dict(checkpoint.model)
+                    self.load_state_dict(checkpoint.model, assign=True)
                 else:
                     with torch.profiler.profile(
                         activities=self.torch_profile_activities,
                         with_stack=True,
                     ) as prof:
-                        self.load_state_dict(checkpoint.model)
+                        self.load_state_dict(checkpoint.model, assign=True)
                     self.torch_profile_load_state = prof
 
+            # Re-establish the wte/lm_head weight tie, which assign=True
+            # severs if the checkpoint stored separate tensors for the
+            # two entries.
+            self.transformer.wte.weight = self.lm_head.weight
+
+            # Keep the tied embedding/lm_head matrix -- the single
+            # largest weight -- in one contiguous buffer so the lm_head
+            # GEMM hits cuBLAS's fast path instead of a strided load,
+            # and so it stays resident in L2 across the embedding lookup
+            # and the classifier matmul.
+            if not self.lm_head.weight.data.is_contiguous():
+                self.lm_head.weight.data = (
+                    self.lm_head.weight.data.contiguous()
+                )
+                self.transformer.wte.weight = self.lm_head.weight
+            assert (
+                self.transformer.wte.weight.data_ptr()
+                == self.lm_head.weight.data_ptr()
+            ), 'wte/lm_head weights are not tied.'
+
             msg = f'Loaded model weights in {timer.elapsed:.3f} seconds.'
             logging.info(msg)
 
@@ -493,9 +618,41 @@ class GPT(nn.Module):
         self.enc = enc
         self.stop_token = stop_token
 
+        # Precompute each token's decoded fragment and printability once,
+        # so the per-step cost during generation is two list indexes
+        # rather than a tiktoken BPE hash lookup plus a character scan.
+        # Tokens that decode to invalid UTF-8 (partial sequences decode to
+        # U+FFFD) are non-printable, matching the previous termination
+        # behaviour, as are vocab slots beyond the tokenizer's range
+        # (50304 model vocab vs 50257 tokenizer vocab), which previously
+        # raised a KeyError if ever sampled.
+        vocab_size = self.config.vocab_size
+        id_to_str = [''] * vocab_size
+        token_is_printable = [False] * vocab_size
+        printable = self.printable
+        for i in range(min(enc.n_vocab, vocab_size)):
+            fragment = enc.decode([i])
+            id_to_str[i] = fragment
+            token_is_printable[i] = all(c in printable for c in fragment)
+        self._id_to_str = id_to_str
+        self._token_is_printable = token_is_printable
+
         # Set to eval.
         self.eval()
 
+        # Compile the forward pass used by the generation hot loops.  The
+        # compilation itself is lazy; the first call triggers inductor
+        # codegen and subsequent calls hit the compiled artifact.  The
+        # "reduce-overhead" mode captures CUDA graphs where possible, which
+        # eliminates the per-step kernel launch overhead that dominates
+        # autoregressive decoding in eager mode.
+        self._compiled_forward = torch.compile(
+            self.forward,
+            mode='reduce-overhead',
+            fullgraph=False,
+            dynamic=False,
+        )
+
     def print_profile(self):
         if not self.torch_profile_activities:
             raise RuntimeError('No profiler activities were set.')
@@ -528,7 +685,7 @@ class GPT(nn.Module):
                 h=nn.ModuleList(
                     [Block(config) for _ in range(config.n_layer)]
                 ),
-                ln_f=nn.LayerNorm(config.n_embd),
+                ln_f=LayerNorm(config.n_embd),
             )
         )
         self.lm_head = NoInitLinear(
@@ -617,9 +774,28 @@ class GPT(nn.Module):
         device = map_location
         with timer:
             model.to(device)
+            if device.startswith('cuda'):
+                # Cast to bfloat16 for inference on the GPU.  This halves
+                # the weight bytes moved from HBM per forward pass and
+                # doubles tensor-core GEMM throughput on Ampere+, with
+                # negligible accuracy impact for inference.
+                model.to(torch.bfloat16)
         msg = f'Moved model to {device} in {timer.elapsed:.3f} seconds.'
         logging.info(msg)
 
+        # If PARALLELOPEDIA_INT8 is set, quantize the Linear layers.
+        if 'PARALLELOPEDIA_INT8' in os.environ:
+            model = quantize_linear_int8(model)
+
+        # If PARALLELOPEDIA_AOT_DECODE names an artifact path, route the
+        # decode step through the AOT-compiled shared library, building
+        # it first if it doesn't exist yet.
+        aot_path = os.environ.get('PARALLELOPEDIA_AOT_DECODE')
+        if aot_path:
+            if not os.path.exists(aot_path):
+                model.export_decode_step(aot_path)
+            model.load_aot_decode_step(aot_path)
+
         logging.info(
             f"Loaded model from step {checkpoint.step}, "
             f"val_loss {checkpoint.val_loss}"
@@ -745,9 +921,28 @@ class GPT(nn.Module):
         device = map_location
         with timer:
             model.to(device)
+            if device.startswith('cuda'):
+                # Cast to bfloat16 for inference on the GPU.  This halves
+                # the weight bytes moved from HBM per forward pass and
+                # doubles tensor-core GEMM throughput on Ampere+, with
+                # negligible accuracy impact for inference.
+                model.to(torch.bfloat16)
         msg = f'Moved model to {device} in {timer.elapsed:.3f} seconds.'
         logging.info(msg)
 
+        # If PARALLELOPEDIA_INT8 is set, quantize the Linear layers.
+        if 'PARALLELOPEDIA_INT8' in os.environ:
+            model = quantize_linear_int8(model)
+
+        # If PARALLELOPEDIA_AOT_DECODE names an artifact path, route the
+        # decode step through the AOT-compiled shared library, building
+        # it first if it doesn't exist yet.
+        aot_path = os.environ.get('PARALLELOPEDIA_AOT_DECODE')
+        if aot_path:
+            if not os.path.exists(aot_path):
+                model.export_decode_step(aot_path)
+            model.load_aot_decode_step(aot_path)
+
         return model
 
     def _init_weights(self, module):
@@ -766,14 +961,72 @@ class GPT(nn.Module):
         elif isinstance(module, nn.Embedding):
             torch.nn.init.normal_(module.weight, mean=0.0, std=0.02)
 
-    def forward(self, idx, targets=None):
+    def allocate_kv_caches(self, batch_size: int = 1) -> List[Tuple]:
+        """
+        Allocate per-layer key/value caches for incremental decoding.
+
+        Args:
+
+            batch_size (int): Supplies the batch size for which caches will
+                be allocated.
+
+        Returns:
+
+            List[Tuple]: A list of `(k_cache, v_cache)` tensor pairs, one
+            per transformer layer, each of shape
+            `(batch_size, n_head, block_size, head_dim)`.
+        """
+        config = ensure_gpt_config(self.config)
+        head_dim = config.n_embd // config.n_head
+        # The embedding table shares storage with lm_head but, unlike
+        # lm_head, is never swapped out by quantization, so it is the
+        # reliable source for the activation dtype.
+        dtype = self.transformer.wte.weight.dtype
+        shape = (batch_size, config.n_head, config.block_size, head_dim)
+        return [
+            (
+                torch.empty(shape, dtype=dtype, device=self.device),
+                torch.empty(shape, dtype=dtype, device=self.device),
+            )
+            for _ in range(config.n_layer)
+        ]
+
+    def _prefill_bucket(self, length: int) -> int:
+        """
+        Round a prompt length up to the nearest prefill shape bucket,
+        capped at the model's block size.
+        """
+        block_size = ensure_gpt_config(self.config).block_size
+        for bucket in PREFILL_BUCKETS:
+            if bucket >= length:
+                return min(bucket, block_size)
+        return block_size
+
+    def forward(self, idx, targets=None, kv_caches=None, position=0,
+                return_last_only=False, last_token_index=-1):
         # idx is of shape (B, T)
         B, T = idx.size()
 
+        if torch.is_tensor(position):
+            # The decode loops pass the position as a 0-dim int64
+            # tensor; turn it into an unbacked SymInt (the same
+            # .item() + torch._check() pattern _DecodeStep uses) so
+            # one compiled graph serves every decode step.  A raw
+            # Python int would be specialized on under dynamic=False,
+            # recompiling each step until the recompile limit and then
+            # running permanently eager.
+            position = position.item()
+            torch._check(position >= 0)
+            torch._check(position < self.transformer.wpe.weight.size(0))
+
         # Forward the token and position embeddings.
 
-        # Shape (T)
-        pos = torch.arange(0, T, dtype=torch.long, device=idx.device)
+        # Shape (T).  When decoding incrementally with KV caches, `idx`
+        # only contains the newest token(s), so offset the positions by
+        # where we are in the overall sequence.
+        pos = torch.arange(
+            position, position + T, dtype=torch.long, device=idx.device
+        )
 
         # Position embeddings of shape (T, n_embd).
         pos_emb = self.transformer.wpe(pos)
@@ -784,14 +1037,33 @@ class GPT(nn.Module):
         x = tok_emb + pos_emb
 
         # Forward the blocks of the transformer.
-        for block in self.transformer.h:
-            x = block(x)
+        if kv_caches is None:
+            for block in self.transformer.h:
+                x = block(x)
+        else:
+            for (block, kv_cache) in zip(self.transformer.h, kv_caches):
+                x = block(x, kv_cache=kv_cache, position=position)
 
         # Forward the final layernorm and the classifier.
         x = self.transformer.ln_f(x)
 
-        # (B, T, vocab_size)
-        logits = self.lm_head(x)
+        if return_last_only and targets is None:
+            # During generation only the final position's logits are ever
+            # consumed, so restrict the lm_head matmul to the last token:
+            # (B, 1, vocab_size) instead of (B, T, vocab_size).  When the
+            # input was padded to a shape bucket, the caller supplies the
+            # index of the final valid position instead -- as a 0-dim
+            # tensor, unbacked like `position` above, so the bucketed
+            # prefill graph is reused across prompt lengths rather than
+            # specialized per length.
+            if torch.is_tensor(last_token_index):
+                last_token_index = last_token_index.item()
+                torch._check(last_token_index >= 0)
+                torch._check(last_token_index < T)
+            logits = self.lm_head(x[:, last_token_index, :].unsqueeze(1))
+        else:
+            # (B, T, vocab_size)
+            logits = self.lm_head(x)
 
         loss = None
         if targets is not None:
@@ -827,14 +1099,37 @@ class GPT(nn.Module):
         device = self.device
         stop_token = self.stop_token
 
-        # Encode prompt -> tensor of shape (1, T)
+        # Encode prompt -> preallocated token buffer of shape
+        # (1, max_length).  Generated tokens are written in place at
+        # `cur_len` instead of torch.cat()'ing a brand-new tensor (and
+        # copying the full prefix) every step.
         tokens = enc.encode(text)
+        num_prompt_tokens = len(tokens)
 
-        x = torch.tensor(
+        # Round the prefill up to a fixed shape bucket (the pad region is
+        # zero-filled below).  Right-padding is safe with causal
+        # attention: valid positions never attend to the pad slots, and
+        # each decode step overwrites the pad K/V at its own position.
+        prefill_len = self._prefill_bucket(num_prompt_tokens)
+
+        buf = torch.empty(
+            (1, max(max_length, prefill_len)),
+            dtype=torch.long,
+            device=device,
+        )
+        # Stage the prompt in pinned host memory and issue the H2D copy
+        # asynchronously so it overlaps with the first kernel launches of
+        # the prefill pass, rather than blocking on a pageable transfer.
+        on_cuda = device.startswith('cuda')
+        host_tokens = torch.tensor(
             tokens,
             dtype=torch.long,
-            device=device
-        ).unsqueeze(0)
+            pin_memory=on_cuda,
+        )
+        buf[0, :num_prompt_tokens] = host_tokens.to(
+            device, non_blocking=on_cuda
+        )
+        buf[0, num_prompt_tokens:prefill_len] = 0
 
         # Create a random generator for reproducibility.
         sample_rng = torch.Generator(device=device)
@@ -844,51 +1139,106 @@ class GPT(nn.Module):
 
         output = []
 
+        # Allocate per-layer KV caches so each decode step only runs the
+        # model over the newest token, attending against the cached prefix.
+        kv_caches = self.allocate_kv_caches()
+        cur_len = num_prompt_tokens
+
+        # Reusable 0-dim position tensor for the decode steps.  Kept on
+        # the CPU: the value is consumed host-side (via .item(), for the
+        # KV-cache slicing), so a device-resident tensor would add a
+        # sync per step for no benefit.
+        position_t = torch.zeros((), dtype=torch.long)
+
         # Generate tokens up to our max length, or until we hit the stop token.
         start = time.perf_counter()
         count = 0
-        while x.size(1) < max_length:
-            count += 1
-            with torch.no_grad():
-                # Forward pass, ignoring the returned loss.
-                (logits, _) = self(x)
 
-            # Take the logits at the last time-step (shape: (1, vocab_size)).
-            logits = logits[:, -1, :]
-
-            # Convert to probabilities.
-            probs = F.softmax(logits, dim=-1)
-
-            # Top-k sampling.
-            topk_probs, topk_indices = torch.topk(probs, k=top_k, dim=-1)
-
-            # Sample the next token.
-            next_idx = torch.multinomial(
-                topk_probs,
-                num_samples=1,
-                generator=sample_rng,
+        # Run the entire decoding loop under inference_mode, which is
+        # strictly stronger than no_grad: version-counter book-keeping
+        # and view metadata tracking are disabled for the sampling ops
+        # (topk, softmax, multinomial, gather) as well as the forward
+        # passes themselves.
+        with torch.inference_mode():
+            # Prefill: run the full prompt through the model once to
+            # populate the KV caches.  The index of the last valid token
+            # goes in as a 0-dim CPU tensor so the bucketed prefill graph
+            # isn't respecialized for every distinct prompt length.
+            (logits, _) = self._compiled_forward(
+                buf[:, :prefill_len],
+                kv_caches=kv_caches,
+                return_last_only=True,
+                last_token_index=torch.tensor(
+                    num_prompt_tokens - 1, dtype=torch.long
+                ),
             )
-            next_token = torch.gather(topk_indices, -1, next_idx)  # (1, 1)
 
-            # If the next token is the stop token, we're done.
-            next_token_item = next_token.item()
-            if next_token_item == stop_token:
-                break
-
-            # Append token to current sequence.  Although we only yield a
-            # singular decoded token below, we still need to keep track of
-            # the entire sequence for subsequent generation steps.
-            x = torch.cat((x, next_token), dim=1)
+            while cur_len < max_length:
+                count += 1
 
-            # Decode the newly-generated token.
-            new_text_fragment = enc.decode([next_token.item()])
+                # Take the logits at the last time-step; shape is
+                # (1, vocab_size).
+                last_logits = logits[:, -1, :]
 
-            # If the next token isn't printable, terminate generation.  (With
-            # our locally-trained GPT2 124M model, this happens quite often.)
-            if not all(c in self.printable for c in new_text_fragment):
-                break
+                # Top-k first, then softmax over just the k survivors.
+                # Softmax-then-top-k is monotonic in the logits, so this is
+                # semantically identical but shrinks the softmax workload
+                # from vocab_size (50304) elements down to top_k (<= 50).
+                topk_logits, topk_indices = torch.topk(
+                    last_logits, k=top_k, dim=-1
+                )
+                topk_probs = F.softmax(topk_logits, dim=-1)
 
-            output.append(new_text_fragment)
+                # Sample the next token.
+                next_idx = torch.multinomial(
+                    topk_probs,
+                    num_samples=1,
+                    generator=sample_rng,
+                )
+                next_token = topk_indices.gather(-1, next_idx)  # (1, 1)
+
+                # A single host round-trip per step: fetch the sampled token
+                # once and reuse it for both the stop check and decoding below,
+                # rather than forcing a second GPU->CPU sync via .item().
+                next_token_item = next_token.item()
+
+                # If the next token is the stop token, we're done.
+                if next_token_item == stop_token:
+                    break
+
+                # Write the token into the preallocated buffer.  The KV
+                # caches track the attention state; the sequence itself is
+                # only retained for book-keeping purposes.
+                buf[0, cur_len].copy_(next_token[0, 0])
+
+                # If the next token isn't printable, terminate
+                # generation.  (With our locally-trained GPT2 124M model,
+                # this happens quite often.)
+                if not self._token_is_printable[next_token_item]:
+                    break
+
+                # Decode the newly-generated token via the precomputed
+                # lookup table.
+                new_text_fragment = self._id_to_str[next_token_item]
+
+                output.append(new_text_fragment)
+
+                cur_len += 1
+                if cur_len >= max_length:
+                    break
+
+                # Forward pass for just the new token; attention runs
+                # against the cached prefix, making each step O(T) instead
+                # of O(T^2).  The position is handed over as a 0-dim CPU
+                # tensor (updated in place each step) so the compiled
+                # forward doesn't specialize on the int value.
+                position_t.fill_(cur_len - 1)
+                (logits, _) = self._compiled_forward(
+                    next_token,
+                    kv_caches=kv_caches,
+                    position=position_t,
+                    return_last_only=True,
+                )
 
         end = time.perf_counter()
         elapsed = end - start
@@ -947,18 +1297,17 @@ class GPT(nn.Module):
 
         # Generate tokens up to our max length, or until we hit the stop token.
         for _ in range(max_length):
-            with torch.no_grad():
+            with torch.inference_mode():
                 # Forward pass, ignoring the returned loss.
                 (logits, _) = self(x)
 
             # Take the logits at the last time-step (shape: (1, vocab_size)).
             logits = logits[:, -1, :]
 
-            # Convert to probabilities.
-            probs = F.softmax(logits, dim=-1)
-
-            # Top-k sampling.
-            topk_probs, topk_indices = torch.topk(probs, k=top_k, dim=-1)
+            # Top-k first, then softmax over just the k survivors (see
+            # generate() for rationale).
+            topk_logits, topk_indices = torch.topk(logits, k=top_k, dim=-1)
+            topk_probs = F.softmax(topk_logits, dim=-1)
 
             # Sample the next token.
             next_idx = torch.multinomial(
@@ -966,10 +1315,14 @@ class GPT(nn.Module):
                 num_samples=1,
                 #generator=sample_rng,
             )
-            next_token = torch.gather(topk_indices, -1, next_idx)  # (1, 1)
+            next_token = topk_indices.gather(-1, next_idx)  # (1, 1)
 
-            # If the next token is the stop token, we're done.
+            # A single host round-trip per step: fetch the sampled token
+            # once and reuse it for both the stop check and decoding below,
+            # rather than forcing a second GPU->CPU sync via .item().
             next_token_item = next_token.item()
+
+            # If the next token is the stop token, we're done.
             if next_token_item == stop_token:
                 break
 
@@ -1007,11 +1360,31 @@ class GPT(nn.Module):
         enc = self.enc
         stop_token = self.stop_token
 
-        # Encode the prompt -> tensor of shape (1, T)
+        # Encode the prompt -> preallocated token buffer of shape
+        # (1, max_length), written to in place each step as in generate().
         tokens = enc.encode(text)
-        x = torch.tensor(
-            tokens, dtype=torch.long, device=self.device
-        ).unsqueeze(0)
+        num_prompt_tokens = len(tokens)
+
+        # Round the prefill up to a fixed shape bucket, as in generate().
+        prefill_len = self._prefill_bucket(num_prompt_tokens)
+
+        buf = torch.empty(
+            (1, max(max_length, prefill_len)),
+            dtype=torch.long,
+            device=self.device,
+        )
+        # Stage the prompt in pinned host memory with an async H2D copy,
+        # as in generate().
+        on_cuda = self.device.startswith('cuda')
+        host_tokens = torch.tensor(
+            tokens,
+            dtype=torch.long,
+            pin_memory=on_cuda,
+        )
+        buf[0, :num_prompt_tokens] = host_tokens.to(
+            self.device, non_blocking=on_cuda
+        )
+        buf[0, num_prompt_tokens:prefill_len] = 0
 
         sample_rng = torch.Generator(device=self.device)
         if seed is None:
@@ -1023,55 +1396,126 @@ class GPT(nn.Module):
             f'with seed {seed}.'
         )
 
+        # Allocate per-layer KV caches so each decode step only runs the
+        # model over the newest token, attending against the cached prefix.
+        kv_caches = self.allocate_kv_caches()
+        cur_len = num_prompt_tokens
+
+        # Reusable 0-dim position tensor for the decode steps, as in
+        # generate().
+        position_t = torch.zeros((), dtype=torch.long)
+
         start_time = time.perf_counter()
         count = 0
-        while x.size(1) < max_length:
-            count += 1
-            with torch.no_grad():
-                # Forward pass, ignoring the returned loss.
-                (logits, _) = self(x)
 
-            # Take the logits at the last time-step (shape: (1, vocab_size)).
-            logits = logits[:, -1, :]
+        if on_cuda:
+            # Pinned staging buffer and event for the per-token D2H copy,
+            # so the copy can be polled without blocking the event loop
+            # thread in .item().
+            host_token = torch.empty(
+                (1, 1), dtype=torch.long, pin_memory=True
+            )
+            copy_done = torch.cuda.Event()
+
+        # N.B. inference_mode is a thread-local guard, so unlike in
+        #      generate() it cannot be held across the yield/await points
+        #      of this generator -- other tasks sharing the event loop
+        #      thread would inherit it.  Instead, each per-step slice of
+        #      tensor work is wrapped individually.
+        with torch.inference_mode():
+            # Prefill: run the full prompt through the model once to
+            # populate the KV caches.  As in generate(), the last valid
+            # token index goes in as a 0-dim CPU tensor so one bucketed
+            # prefill graph covers every prompt length.
+            (logits, _) = self._compiled_forward(
+                buf[:, :prefill_len],
+                kv_caches=kv_caches,
+                return_last_only=True,
+                last_token_index=torch.tensor(
+                    num_prompt_tokens - 1, dtype=torch.long
+                ),
+            )
+
+        while cur_len < max_length:
+            count += 1
 
-            # Convert to probabilities.
-            probs = F.softmax(logits, dim=-1)
+            with torch.inference_mode():
+                # Take the logits at the last time-step; shape is
+                # (1, vocab_size).
+                last_logits = logits[:, -1, :]
+
+                # Top-k first, then softmax over just the k survivors.
+                # Softmax-then-top-k is monotonic in the logits, so this
+                # is semantically identical but shrinks the softmax
+                # workload from vocab_size (50304) elements to top_k
+                # (<= 50).
+                topk_logits, topk_indices = torch.topk(
+                    last_logits, k=top_k, dim=-1
+                )
+                topk_probs = F.softmax(topk_logits, dim=-1)
 
-            # Top-k sampling.
-            topk_probs, topk_indices = torch.topk(probs, k=top_k, dim=-1)
+                # Sample the next token.
+                next_idx = torch.multinomial(
+                    topk_probs,
+                    num_samples=1,
+                    generator=sample_rng,
+                )
+                next_token = topk_indices.gather(-1, next_idx)  # (1, 1)
+
+                # Write the token into the preallocated buffer (a pure
+                # device-side op; no host sync).
+                buf[0, cur_len].copy_(next_token[0, 0])
+
+                if on_cuda:
+                    # Kick off the async D2H copy of the sampled token.
+                    host_token.copy_(next_token, non_blocking=True)
+                    copy_done.record()
+
+                if cur_len + 1 < max_length:
+                    # Launch the next step's forward pass *before* waiting
+                    # on the host copy: the GPU works on token N+1 while
+                    # token N is decoded and streamed to the client.  The
+                    # launch is speculative when the stop token was
+                    # sampled; the wasted step is harmless.
+                    position_t.fill_(cur_len)
+                    (logits, _) = self._compiled_forward(
+                        next_token,
+                        kv_caches=kv_caches,
+                        position=position_t,
+                        return_last_only=True,
+                    )
 
-            # Sample the next token.
-            next_idx = torch.multinomial(
-                topk_probs,
-                num_samples=1,
-                generator=sample_rng,
-            )
-            next_token = torch.gather(topk_indices, -1, next_idx)  # (1, 1)
+            if on_cuda:
+                # Yield to the event loop until the copy lands rather
+                # than blocking the thread in .item().
+                while not copy_done.query():
+                    await asyncio.sleep(0)
+                next_token_item = int(host_token[0, 0])
+            else:
+                next_token_item = next_token.item()
 
             # If the next token is the stop token, we're done.
-            next_token_item = next_token.item()
             if next_token_item == stop_token:
                 break
 
-            # Append token to current sequence.  Although we only yield a
-            # singular decoded token below, we still need to keep track of
-            # the entire sequence for subsequent generation steps.
-            x = torch.cat((x, next_token), dim=1)
-
-            # Decode the newly-generated token.
-            new_text_fragment = enc.decode([next_token.item()])
-
             # If the next token isn't printable, terminate generation.  (With
             # our locally-trained GPT2 124M model, this happens quite often.)
-            if not all(c in self.printable for c in new_text_fragment):
+            if not self._token_is_printable[next_token_item]:
                 yield -1
                 break
 
+            # Decode the newly-generated token via the precomputed lookup
+            # table.
+            new_text_fragment = self._id_to_str[next_token_item]
+
             yield new_text_fragment
 
-            # Yield control back to the event loop before continuing
-            # generation.
-            await asyncio.sleep(0)
+            cur_len += 1
+
+            if not on_cuda and (count % 8) == 0:
+                # CPU decoding runs the forward pass on the event loop
+                # thread; periodically give other tasks a chance to run.
+                await asyncio.sleep(0)
 
         elapsed = time.perf_counter() - start_time
         logging.debug(
@@ -1079,6 +1523,191 @@ class GPT(nn.Module):
             f"{elapsed:.2f} seconds (~{count / elapsed:.2f} tok/s)"
         )
 
+    def export_decode_step(self, output_path: str) -> str:
+        """
+        Ahead-of-time compile the single-token decode step to a shared
+        library via `torch.export` + AOT-Inductor.
+
+        Unlike the lazily-JIT-compiled forward, the resulting artifact
+        is a self-contained C++ runtime: loading it in a fresh process
+        (see `load_aot_decode_step()`) skips inductor codegen entirely,
+        so the first request after server start pays no warm-up stall,
+        and each decode step dispatches straight into compiled code
+        without re-entering the Python dispatcher.
+
+        Args:
+
+            output_path (str): Supplies the path at which to write the
+                compiled shared library (conventionally `*.so`).
+
+        Returns:
+
+            str: The path of the compiled artifact.
+        """
+        import torch._inductor
+
+        timer = ElapsedTimer()
+
+        step = _DecodeStep(self)
+        kv_caches = self.allocate_kv_caches()
+        flat_caches = [t for pair in kv_caches for t in pair]
+        example_token = torch.zeros(
+            (1, 1), dtype=torch.long, device=self.device
+        )
+        example_position = torch.tensor(
+            0, dtype=torch.long, device=self.device
+        )
+        example_inputs = (example_token, example_position, *flat_caches)
+
+        with timer:
+            exported = torch.export.export(step, example_inputs)
+            artifact_path = torch._inductor.aot_compile(
+                exported.module(),
+                example_inputs,
+                options={'aot_inductor.output_path': output_path},
+            )
+        msg = f'AOT-compiled decode step in {timer.elapsed:.3f} seconds.'
+        logging.info(msg)
+        return artifact_path
+
+    def load_aot_decode_step(self, path: str) -> None:
+        """
+        Load an AOT-compiled decode step produced by
+        `export_decode_step()` and route single-token cached decode
+        calls through it.
+
+        Prefill and full-context calls (more than one token, or no KV
+        caches) continue to go through the JIT-compiled forward; only
+        the steady-state decode step hits the AOT artifact.
+
+        Args:
+
+            path (str): Supplies the path to the compiled shared
+                library.
+        """
+        import torch._export
+
+        # aot_load is the matching loader for the shared library that
+        # export_decode_step() emits via torch._inductor.aot_compile;
+        # torch._inductor.package.load_package only understands .pt2
+        # archives from aoti_compile_and_package.
+        aot_step = torch._export.aot_load(path, self.device)
+
+        compiled_forward = self._compiled_forward
+
+        def _aot_forward(idx, targets=None, kv_caches=None, position=0,
+                         return_last_only=False, last_token_index=-1):
+            if kv_caches is None or idx.size(1) != 1 or not return_last_only:
+                return compiled_forward(
+                    idx,
+                    targets=targets,
+                    kv_caches=kv_caches,
+                    position=position,
+                    return_last_only=return_last_only,
+                    last_token_index=last_token_index,
+                )
+            if torch.is_tensor(position):
+                position_t = position.to(idx.device)
+            else:
+                position_t = torch.tensor(
+                    position, dtype=torch.long, device=idx.device
+                )
+            flat_caches = [t for pair in kv_caches for t in pair]
+            logits = aot_step(idx, position_t, *flat_caches)
+            return (logits, None)
+
+        self._compiled_forward = _aot_forward
+
+
+def quantize_linear_int8(model: GPT) -> GPT:
+    """
+    Applies INT8 weight-only quantization to the model's Linear layers.
+
+    At batch size 1, the decode-loop GEMMs (c_attn, c_proj, c_fc, lm_head)
+    are memory-bound on weight loads, so halving the weight bytes moved
+    from HBM yields a near-2x tokens/sec improvement.  On CUDA devices
+    this uses bitsandbytes' Linear8bitLt (INT8 weights, 16-bit
+    activations, dequant-in-GEMM) when available; on CPU it falls back to
+    torch.ao dynamic quantization.
+
+    The lm_head layer is skipped on both paths as its weight is tied to
+    the token embedding table.
+
+    Args:
+
+        model (GPT): Supplies the model to quantize in-place (CUDA) or
+            convert (CPU).
+
+    Returns:
+
+        GPT: The quantized model.
+    """
+    device = model.device
+    if device.startswith('cuda'):
+        try:
+            import bitsandbytes as bnb
+        except ImportError:
+            logging.warning(
+                'bitsandbytes is not available; skipping INT8 quantization.'
+            )
+            return model
+
+        lm_head = model.lm_head
+
+        def convert(module):
+            for (name, child) in module.named_children():
+                if isinstance(child, nn.Linear) and child is not lm_head:
+                    qlinear = bnb.nn.Linear8bitLt(
+                        child.in_features,
+                        child.out_features,
+                        bias=child.bias is not None,
+                        has_fp16_weights=False,
+                        threshold=6.0,
+                    )
+                    qlinear.weight.data = child.weight.data
+                    if child.bias is not None:
+                        qlinear.bias.data = child.bias.data
+                    setattr(module, name, qlinear)
+                else:
+                    convert(child)
+
+        timer = ElapsedTimer()
+        with timer:
+            convert(model)
+            model.to(device)
+        logging.info(
+            f'Quantized Linear layers to INT8 in {timer.elapsed:.3f} seconds.'
+        )
+        return model
+
+    import torch.ao.nn.quantized.dynamic as nnqd
+    import torch.ao.quantization as tq
+
+    # N.B. The mapping must include NoInitLinear explicitly as the module
+    #      swap is keyed on the exact type, not isinstance().
+    mapping = {
+        nn.Linear: nnqd.Linear,
+        NoInitLinear: nnqd.Linear,
+    }
+    timer = ElapsedTimer()
+    with timer:
+        # Quantize the transformer in place: an out-of-place conversion
+        # deep-copies the model, stranding _compiled_forward (and the
+        # generate loops with it) on the original fp32 weights.
+        # Converting only the transformer also leaves lm_head alone,
+        # mirroring the CUDA branch's handling of the tied weight.
+        tq.quantize_dynamic(
+            model.transformer,
+            {nn.Linear, NoInitLinear},
+            dtype=torch.qint8,
+            mapping=mapping,
+            inplace=True,
+        )
+    logging.info(
+        f'Quantized Linear layers to INT8 in {timer.elapsed:.3f} seconds.'
+    )
+    return model
+
 
 class Gpt2App(HttpApp):
     routes = make_routes()
@@ -1090,6 +1719,19 @@ class Gpt2App(HttpApp):
 
     @classmethod
     def init_once(cls):
+        # Guard against concurrent or repeated initialization: loading
+        # (and compiling) the models is expensive and must only ever
+        # happen once per process, no matter how many apps reference
+        # this module.
+        global INIT_ONCE_DONE
+        with INIT_ONCE_LOCK:
+            if INIT_ONCE_DONE:
+                return
+            cls._init_once_impl()
+            INIT_ONCE_DONE = True
+
+    @classmethod
+    def _init_once_impl(cls):
         load_models()
         load_pretrained_models()
 
@@ -1378,6 +2020,11 @@ def parse_arguments():
             'mode="max_autotune".',
         )
     )
+    parser.add_argument(
+        '--int8',
+        action='store_true',
+        help='Quantize the Linear layers to INT8 (weight-only).',
+    )
     parser.add_argument(
         '--generate-slim',
         action='store_true',
@@ -1450,6 +2097,9 @@ def main():
         logging.info(f'JIT compiled model in {timer.elapsed:.3f} seconds.')
 
 
+    if args.int8:
+        model = quantize_linear_int8(model)
+
     seed = args.seed
     if seed is None or seed == '':
         seed = random.randint(0, 2**32 - 1)
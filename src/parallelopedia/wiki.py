@@ -26,6 +26,14 @@ import mwparserfromhell as mwp
 import numpy as np
 from numpy import uint64
 
+try:
+    # marisa-trie provides a single LOUDS-based, mmap-friendly trie
+    # that replaces the 127 per-character datrie partitions when a
+    # converted titles file is present; fall back silently otherwise.
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
+
 from parallelopedia.http.server import (
     HttpApp,
     RangedRequest,
@@ -62,6 +70,11 @@ if 'PARALLELOPEDIA_WIKI_TITLE_TRIES_DIR' in os.environ:
 else:
     TRIES_DIR = DATA_DIR
 
+# Single-file marisa-trie alternative to the per-character datrie
+# partitions; used when the file exists and marisa_trie is installed.
+MARISA_TITLES_NAME = 'wiki-titles.marisa'
+MARISA_TITLES_PATH = join_path(TRIES_DIR, MARISA_TITLES_NAME)
+
 # This is a sorted numpy array of uint64s representing the byte offset values
 # in the tries.  When given the byte offset of a title derived from a trie
 # lookup, we can find the byte offset of where the next title starts within
@@ -83,7 +96,6 @@ PARTITIONS = 127
 # =============================================================================
 # Aliases
 # =============================================================================
-uint64_7 = uint64(7)
 uint64_11 = uint64(11)
 
 
@@ -121,14 +133,30 @@ def load_trie(path: str) -> datrie.Trie:
 
 def load_wiki_tries_parallel(
     directory: str, max_threads: int = 0
-) -> List[datrie.Trie]:
+) -> dict:
 
     if max_threads < 1:
         max_threads = os.cpu_count()
 
     paths_by_first_char = get_wiki_tries(directory)
-    tries = [None] * PARTITIONS
+    # Keyed by the ordinal of the partition's first character.  Most of
+    # the 127 possible partitions are absent, so a dict is tighter than
+    # a mostly-None list and lookups in the request handlers become a
+    # single dict hit.
+    tries = {}
     num_tries = len(paths_by_first_char)
+
+    # Hint the kernel to start readahead on every file up front, so the
+    # parallel loads below hit warm page cache via bulk sequential reads
+    # instead of stalling on per-page demand faults.
+    if hasattr(os, 'posix_fadvise'):
+        for path in paths_by_first_char.values():
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
     print(
         f'Loading {num_tries} tries in parallel with '
         f'{max_threads} threads...'
@@ -157,27 +185,93 @@ def load_wiki_tries_parallel(
 # =============================================================================
 # Globals
 # =============================================================================
-WIKI_XML_FILE = open(WIKI_XML_PATH, 'rb')
-WIKI_XML_STAT = os.fstat(WIKI_XML_FILE.fileno())
-WIKI_XML_SIZE = WIKI_XML_STAT.st_size
-WIKI_XML_LAST_MODIFIED = date_time_string(WIKI_XML_STAT.st_mtime)
-WIKI_XML_MMAP = mmap.mmap(
-    WIKI_XML_FILE.fileno(),
-    length=0,
-    flags=mmap.MAP_SHARED,
-    prot=mmap.PROT_READ,
-    offset=0,
-)
-try:
-    WIKI_XML_MMAP.madvise(mmap.MADV_RANDOM)
-except AttributeError:
-    # Ignore if madvise is not available.
-    pass
+# These are initialized lazily via _load_wiki_xml(), called from
+# WikiApp.init_once(), so that merely importing this module (tests,
+# CLIs, the class loader) doesn't open and map the ~53GB XML file.
+WIKI_XML_FILE = None
+WIKI_XML_STAT = None
+WIKI_XML_SIZE = None
+WIKI_XML_LAST_MODIFIED = None
+WIKI_XML_MMAP = None
+
+
+def _load_wiki_xml() -> None:
+    """
+    Opens and maps the wiki XML file, populating the module globals
+    above.  Idempotent.
+    """
+    global WIKI_XML_FILE, WIKI_XML_STAT, WIKI_XML_SIZE
+    global WIKI_XML_LAST_MODIFIED, WIKI_XML_MMAP
+
+    if WIKI_XML_MMAP is not None:
+        return
+
+    WIKI_XML_FILE = open(WIKI_XML_PATH, 'rb')
+    WIKI_XML_STAT = os.fstat(WIKI_XML_FILE.fileno())
+    WIKI_XML_SIZE = WIKI_XML_STAT.st_size
+    WIKI_XML_LAST_MODIFIED = date_time_string(WIKI_XML_STAT.st_mtime)
+    WIKI_XML_MMAP = mmap.mmap(
+        WIKI_XML_FILE.fileno(),
+        length=0,
+        flags=mmap.MAP_SHARED,
+        prot=mmap.PROT_READ,
+        offset=0,
+    )
+
+
+def advise_wiki_xml_range(start: int, end: int, advice: int = None) -> None:
+    """
+    Hints the kernel that the byte range `[start, end]` of the wiki XML
+    mapping is about to be read, so the pages arrive via bulk readahead
+    rather than serialized 4 KB demand faults.  No-op on platforms
+    without madvise support.
+
+    Args:
 
-# These are initialied in WikiApp.init_once().
+        start (int): Supplies the first byte offset of the range.
+
+        end (int): Supplies the last byte offset of the range.
+
+        advice (int): Optionally supplies the madvise advice constant;
+            defaults to MADV_WILLNEED.
+    """
+    if WIKI_XML_MMAP is None:
+        return
+    if advice is None:
+        advice = getattr(mmap, 'MADV_WILLNEED', None)
+        if advice is None:
+            return
+    page_mask = mmap.PAGESIZE - 1
+    page_start = start & ~page_mask
+    # Client-supplied ranges reach here before ranged_sendfile_mmap()
+    # clamps them against the file size, so bail out rather than hand
+    # madvise an offset or length outside the mapping.
+    if page_start < 0 or page_start >= WIKI_XML_SIZE:
+        return
+    length = (end - page_start + mmap.PAGESIZE) & ~page_mask
+    length = min(length, WIKI_XML_SIZE - page_start)
+    if length <= 0:
+        return
+    try:
+        WIKI_XML_MMAP.madvise(advice, page_start, length)
+    except (AttributeError, ValueError, OSError):
+        # madvise unavailable, or a range the kernel rejects; the hint
+        # is purely advisory either way.
+        pass
+
+
+# These are initialied in WikiApp.init_once().  TITLE_END_OFFSETS is a
+# parallel array with TITLE_END_OFFSETS[i] = TITLE_OFFSETS[i + 1] - 11,
+# precomputed once so per-request lookups index an end offset directly
+# instead of recomputing the subtraction per query.
 TITLE_OFFSETS = None
+TITLE_END_OFFSETS = None
 TITLE_TRIES = None
 
+# Single mmap'd marisa-trie over all titles; takes precedence over the
+# partitioned TITLE_TRIES when loaded.
+TITLE_TRIE = None
+
 
 # =============================================================================
 # Misc Helpers
@@ -215,6 +309,40 @@ def text_serialization(request=None, text=None):
     return request
 
 
+# =============================================================================
+# Title Lookup Helpers
+# =============================================================================
+def get_title_values(name: str):
+    """
+    Returns the list of raw signed offsets for an exact title match, or
+    None if the title is unknown.  Dispatches to the single marisa-trie
+    when loaded, otherwise to the per-character datrie partition.
+    """
+    if TITLE_TRIE is not None:
+        records = TITLE_TRIE.get(name)
+        if not records:
+            return None
+        return [record[0] for record in records]
+    titles = TITLE_TRIES.get(ord(name[0]))
+    if not titles or name not in titles:
+        return None
+    return titles[name]
+
+
+def get_title_items(prefix: str) -> List[Tuple[str, tuple]]:
+    """
+    Returns a list of `(title, offsets)` pairs for every title starting
+    with `prefix`.  Dispatches to the single marisa-trie when loaded,
+    otherwise to the per-character datrie partition.
+    """
+    if TITLE_TRIE is not None:
+        return TITLE_TRIE.items(prefix)
+    titles = TITLE_TRIES.get(ord(prefix[0]))
+    if not titles:
+        return []
+    return titles.items(prefix)
+
+
 # =============================================================================
 # Offset Helpers
 # =============================================================================
@@ -225,22 +353,29 @@ def get_page_offsets_for_key(search_string: str) -> List[Tuple[str, int, int]]:
     represent the byte offsets within the wiki XML file where the content
     for this title starts and ends, respectively.
     """
-    if len(search_string) < 1:
-        return None
-    results = []
-    titles = TITLE_TRIES[ord(search_string[0])]
-    if not titles:
-        return results
-    items = titles.items(search_string)
+    if not search_string:
+        return []
+    items = get_title_items(search_string)
     if not items:
-        return results
-    offsets = TITLE_OFFSETS
-    for key, value in items:
-        v = value[0]
-        o = uint64(v if v > 0 else v * -1)
-        ix = offsets.searchsorted(o, side='right')
-        results.append((key, int(o - uint64_7), int(offsets[ix] - uint64_11)))
-    return results
+        return []
+    # Batch the offset resolution: collect the raw signed offsets into
+    # one array, take a vectorized absolute value, and resolve every
+    # neighbouring title with a single searchsorted call rather than one
+    # binary search per Python loop iteration.
+    (keys, values) = zip(*items)
+    raw = np.fromiter(
+        (value[0] for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    os_ = np.abs(raw, out=raw).view(np.uint64)
+    ix = TITLE_OFFSETS.searchsorted(os_, side='right')
+    starts = os_ - 7
+    ends = TITLE_END_OFFSETS[ix - 1]
+    return [
+        (key, int(start), int(end))
+        for (key, start, end) in zip(keys, starts, ends)
+    ]
 
 
 # =============================================================================
@@ -253,16 +388,33 @@ class WikiApp(HttpApp):
 
     @classmethod
     def init_once(cls):
-        global TITLE_OFFSETS, TITLE_TRIES
+        global TITLE_OFFSETS, TITLE_END_OFFSETS, TITLE_TRIES, TITLE_TRIE
 
         timer = ElapsedTimer()
+        with timer:
+            _load_wiki_xml()
+        logging.info(f'Mapped wiki XML in {timer.elapsed:.4f} seconds.')
+
         with timer:
             TITLE_OFFSETS = np.load(TITLES_OFFSETS_NPY_PATH)
+            TITLE_END_OFFSETS = TITLE_OFFSETS[1:] - uint64_11
         logging.info(f'Loaded title offsets in {timer.elapsed:.4f} seconds.')
 
-        with timer:
-            TITLE_TRIES = load_wiki_tries_parallel(TRIES_DIR)
-        logging.info(f'Loaded title tries in {timer.elapsed:.4f} seconds.')
+        if marisa_trie is not None and os.path.exists(MARISA_TITLES_PATH):
+            # The single-file LOUDS trie mmaps in zero-copy, so startup
+            # is one mapping rather than 127 parallel datrie loads.
+            with timer:
+                TITLE_TRIE = marisa_trie.RecordTrie('<q')
+                TITLE_TRIE.mmap(MARISA_TITLES_PATH)
+            logging.info(
+                f'Mapped title trie in {timer.elapsed:.4f} seconds.'
+            )
+        else:
+            with timer:
+                TITLE_TRIES = load_wiki_tries_parallel(TRIES_DIR)
+            logging.info(
+                f'Loaded title tries in {timer.elapsed:.4f} seconds.'
+            )
 
     @route
     def wiki(self, request, name, **kwds):
@@ -271,16 +423,19 @@ class WikiApp(HttpApp):
         if len(name) < 1:
             return server.error(request, 400, "Name too short (< 1 char)")
 
-        titles = TITLE_TRIES[ord(name[0])]
-        if not titles or name not in titles:
+        values = get_title_values(name)
+        if values is None:
             return server.error(request, 404)
 
-        o = titles[name][0]
-        o = uint64(o if o > 0 else o * -1)
-        offsets = TITLE_OFFSETS
-        ix = offsets.searchsorted(o, side='right')
-        start = int(o - uint64_7)
-        end = int(offsets[ix] - uint64_11)
+        # Plain Python int arithmetic here: searchsorted accepts ints
+        # directly, and constructing np.uint64 scalars per request just
+        # adds allocation and ufunc-dispatch overhead.
+        v = values[0]
+        o = v if v > 0 else -v
+        ix = TITLE_OFFSETS.searchsorted(o, side='right')
+        start = o - 7
+        end = int(TITLE_END_OFFSETS[ix - 1])
+        advise_wiki_xml_range(start, end)
         range_request = '%d-%d' % (start, end)
         request.range = RangedRequest(range_request)
         request.response.content_type = 'text/xml; charset=utf-8'
@@ -310,6 +465,9 @@ class WikiApp(HttpApp):
         if not request.range:
             return server.error(request, 400, "Ranged-request required.")
         else:
+            rr = request.range
+            if rr.first_byte is not None and rr.last_byte is not None:
+                advise_wiki_xml_range(rr.first_byte, rr.last_byte)
             request.response.content_type = 'text/xml; charset=utf-8'
             return server.ranged_sendfile_mmap(
                 request,
@@ -333,6 +491,13 @@ class WikiApp(HttpApp):
         response.message = 'OK'
         response.content_type = 'text/html; charset=UTF-8'
 
+        # The wikitext parser scans the whole slice linearly, so ask the
+        # kernel for bulk sequential readahead of the range up front.
+        advise_wiki_xml_range(rr.first_byte, rr.last_byte)
+        seq = getattr(mmap, 'MADV_SEQUENTIAL', None)
+        if seq is not None:
+            advise_wiki_xml_range(rr.first_byte, rr.last_byte, seq)
+
         file_content = WIKI_XML_MMAP[rr.first_byte:rr.last_byte + 1]
 
         code = mwp.parse(file_content)
@@ -353,11 +518,10 @@ class WikiApp(HttpApp):
         if len(name) < 1:
             return server.error(request, 400, "Name too short (< 1 char)")
 
-        titles = TITLE_TRIES[ord(name[0])]
-        if not titles or name not in titles:
+        if get_title_values(name) is None:
             return server.error(request, 404)
 
-        items = titles.items(name)
+        items = get_title_items(name)
         return server.send_response(json_serialization(request, items))
 
     @route
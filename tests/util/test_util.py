@@ -0,0 +1,62 @@
+import sys
+import types
+
+import datrie
+import numpy as np
+
+try:
+    import parallelopedia
+except ImportError:
+    sys.path.append('../src')
+    import parallelopedia
+
+from parallelopedia import util
+
+
+def test_extract_trie_merges_and_sorts_once():
+    source = datrie.Trie(util.ALLOWED)
+    source['apple'] = [30, 10, 30]
+    source['apricot'] = [7]
+    source['banana'] = [1]
+
+    result = util.extract_trie(source, ('a',))
+    assert result['apple'] == [10, 30]
+    assert result['apricot'] == [7]
+    assert 'banana' not in result
+
+
+def test_get_sorted_values_from_trie():
+    source = datrie.Trie(util.ALLOWED)
+    # Negative values mark redirects; the result is their absolute
+    # values, deduped and sorted.
+    source['a'] = [-5, 9]
+    source['b'] = [9, -2]
+
+    values = util.get_sorted_values_from_trie(source)
+    assert values.dtype == np.uint64
+    assert values.tolist() == [2, 5, 9]
+
+
+def test_get_class_from_string_caches_resolution(monkeypatch):
+    calls = []
+
+    class Spam:
+        @classmethod
+        def init_once(cls):
+            calls.append(1)
+
+    module = types.ModuleType('fake_spam_module')
+    module.Spam = Spam
+    monkeypatch.setitem(sys.modules, 'fake_spam_module', module)
+
+    before = util._resolve_class.cache_info()
+    first = util.get_class_from_string('fake_spam_module.Spam')
+    second = util.get_class_from_string('fake_spam_module.Spam')
+    after = util._resolve_class.cache_info()
+
+    assert first is Spam
+    assert second is Spam
+    # The second resolution is a cache hit, but init_once() stays
+    # outside the cache and runs on every call.
+    assert after.hits == before.hits + 1
+    assert calls == [1, 1]
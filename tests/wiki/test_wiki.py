@@ -0,0 +1,126 @@
+import mmap
+
+import numpy as np
+import pytest
+
+try:
+    import parallelopedia
+except ImportError:
+    import sys
+
+    sys.path.append('../src')
+    import parallelopedia
+
+from parallelopedia import wiki
+
+
+class FakeTrie:
+    """Minimal stand-in for a datrie.Trie partition."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def items(self, prefix):
+        return [
+            (key, value)
+            for (key, value) in self._items
+            if key.startswith(prefix)
+        ]
+
+
+class FakeMmap:
+    """Records madvise calls issued against it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def madvise(self, advice, start, length):
+        self.calls.append((advice, start, length))
+
+
+@pytest.fixture
+def synthetic_offsets(monkeypatch):
+    # Four titles starting at 100, 250, 400, with a trailing sentinel.
+    offsets = np.array([100, 250, 400, 1000], dtype=np.uint64)
+    monkeypatch.setattr(wiki, 'TITLE_OFFSETS', offsets)
+    monkeypatch.setattr(wiki, 'TITLE_END_OFFSETS', offsets[1:] - 11)
+    monkeypatch.setattr(wiki, 'TITLE_TRIE', None)
+    return offsets
+
+
+def test_get_page_offsets_for_key(monkeypatch, synthetic_offsets):
+    # A negative trie value marks a redirect; the offset math must use
+    # its absolute value.
+    trie = FakeTrie([('Apple', [100]), ('Apricot', [-250])])
+    monkeypatch.setattr(wiki, 'TITLE_TRIES', {ord('A'): trie})
+
+    results = wiki.get_page_offsets_for_key('Ap')
+    assert results == [
+        ('Apple', 100 - 7, 250 - 11),
+        ('Apricot', 250 - 7, 400 - 11),
+    ]
+
+
+def test_get_page_offsets_for_key_no_match(monkeypatch, synthetic_offsets):
+    trie = FakeTrie([('Apple', [100])])
+    monkeypatch.setattr(wiki, 'TITLE_TRIES', {ord('A'): trie})
+
+    assert wiki.get_page_offsets_for_key('') == []
+    assert wiki.get_page_offsets_for_key('Banana') == []
+    assert wiki.get_page_offsets_for_key('Az') == []
+
+
+@pytest.mark.skipif(
+    not hasattr(mmap, 'MADV_WILLNEED'), reason='madvise not available'
+)
+def test_advise_wiki_xml_range_aligns_and_covers(monkeypatch):
+    fake = FakeMmap()
+    size = 16 * mmap.PAGESIZE
+    monkeypatch.setattr(wiki, 'WIKI_XML_MMAP', fake)
+    monkeypatch.setattr(wiki, 'WIKI_XML_SIZE', size)
+
+    start = mmap.PAGESIZE + 100
+    end = (3 * mmap.PAGESIZE) + 100
+    wiki.advise_wiki_xml_range(start, end)
+
+    assert len(fake.calls) == 1
+    (advice, page_start, length) = fake.calls[0]
+    assert advice == mmap.MADV_WILLNEED
+    assert page_start % mmap.PAGESIZE == 0
+    assert page_start <= start
+    assert page_start + length > end
+    assert page_start + length <= size
+
+
+@pytest.mark.skipif(
+    not hasattr(mmap, 'MADV_WILLNEED'), reason='madvise not available'
+)
+def test_advise_wiki_xml_range_clamps_to_mapping(monkeypatch):
+    fake = FakeMmap()
+    size = 16 * mmap.PAGESIZE
+    monkeypatch.setattr(wiki, 'WIKI_XML_MMAP', fake)
+    monkeypatch.setattr(wiki, 'WIKI_XML_SIZE', size)
+
+    # Ranges are advised before ranged_sendfile_mmap() clamps them, so
+    # an end past EOF must be clamped to the mapping.
+    wiki.advise_wiki_xml_range(size - 100, size + (5 * mmap.PAGESIZE))
+    assert len(fake.calls) == 1
+    (_, page_start, length) = fake.calls[0]
+    assert page_start + length <= size
+
+
+@pytest.mark.skipif(
+    not hasattr(mmap, 'MADV_WILLNEED'), reason='madvise not available'
+)
+def test_advise_wiki_xml_range_ignores_out_of_range(monkeypatch):
+    fake = FakeMmap()
+    monkeypatch.setattr(wiki, 'WIKI_XML_MMAP', fake)
+    monkeypatch.setattr(wiki, 'WIKI_XML_SIZE', 16 * mmap.PAGESIZE)
+
+    wiki.advise_wiki_xml_range(99999999999999, 99999999999999)
+    assert fake.calls == []
+
+
+def test_advise_wiki_xml_range_noop_before_mapping(monkeypatch):
+    monkeypatch.setattr(wiki, 'WIKI_XML_MMAP', None)
+    wiki.advise_wiki_xml_range(0, 100)